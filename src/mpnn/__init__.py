@@ -1,6 +1,5 @@
 """ProteinMPNN mini-service wrapper."""
 
-from .runner.design import run_design
 from .core import CoreError, InputError, ExecutionError
 from .core import DesignPayload, DesignResponse, DesignMetadata, DesignedSequence
 
@@ -14,3 +13,12 @@ __all__ = [
     "DesignMetadata",
     "DesignedSequence",
 ]
+
+
+def __getattr__(name: str):
+    # Resolve run_design lazily so `import mpnn.core` does not load the runner.
+    if name == "run_design":
+        from .runner.design import run_design
+
+        return run_design
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
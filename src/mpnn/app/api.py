@@ -4,45 +4,77 @@ uvicorn mpnn.app.api:create_app --factory --host 0.0.0.0 --port 8000
 """
 
 
-from __future__ import annotations
-import json
 import anyio
 import functools
+import orjson
+import shutil
 from pathlib import Path
-from typing import Any, Dict
+from typing import Annotated, BinaryIO, Callable, Dict, Union
 from uuid import uuid4
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile
-from pydantic import ValidationError
+from fastapi import Depends, FastAPI, File, Form, HTTPException, Response, UploadFile
+from pydantic import TypeAdapter, ValidationError
 from starlette.middleware.wsgi import WSGIMiddleware
 
-from ..core import AppConfig, ExecutionError, InputError, DesignPayload, load_config
+from ..core import AppConfig, ExecutionError, InputError, DesignPayload, DesignResponse, load_config
 from ..runner.design import run_design
-
-def _parse_payload(payload: str) -> DesignPayload:
-    """Parse and validate the design payload JSON string."""
-
-    #  handle empty/missing fields.
-    try:
-        obj = json.loads(payload)
-    except Exception as e:
-        raise HTTPException(status_code=422, detail="payload must be valid JSON") from e
-
-    # normalize chains and num_sequences fields
-    # 
-    if isinstance(obj, dict):
-        if obj.get("chains") is None:
-            obj["chains"] = ""
-        if obj.get("num_sequences") == "":
-            obj.pop("num_sequences", None)
-
+from ..runner.env import runner_env
+
+def get_run_design() -> Callable[..., DesignResponse]:
+    """Design runner dependency; tests swap it via app.dependency_overrides."""
+    return run_design
+
+# Route parameter types, resolved once at import (this module skips postponed annotations).
+_StructureFile = Annotated[
+    UploadFile, File(description="Structure file (.pdb, .cif, .mmcif, .cif.gz, .mmcif.gz)")
+]
+_PayloadField = Annotated[
+    str,
+    Form(
+        description=(
+            'JSON string. Fields: "chains" (empty/missing for all-chains) and '
+            '"num_sequences" (empty/missing uses server default). Optional field: "model_name".'
+        ),
+    ),
+]
+_RunDesign = Annotated[Callable[..., DesignResponse], Depends(get_run_design)]
+
+# Built once; validate_json parses and validates in a single pass (no intermediate dict).
+_PAYLOAD_ADAPTER = TypeAdapter(DesignPayload)
+# Characters a JSON text can start with (after whitespace).
+_JSON_START = frozenset('{["-0123456789tfn')
+
+def _unprocessable(detail: Union[str, bytes]) -> Response:
+    """422 with FastAPI's {"detail": ...} body; bytes are already-encoded JSON.
+
+    Returned rather than raised as HTTPException: rejects skip the exception
+    handler and jsonable_encoder.
+    """
+    body = detail if isinstance(detail, bytes) else orjson.dumps(detail)
+    return Response(b'{"detail":' + body + b"}", status_code=422, media_type="application/json")
+
+def _parse_payload(payload: str) -> Union[DesignPayload, Response]:
+    """Parse and validate the design payload JSON string (a 422 Response if invalid)."""
+    # Reject obviously non-JSON input without entering the parser.
+    head = payload.lstrip(" \t\n\r")[:1]
+    if head not in _JSON_START:
+        return _unprocessable("payload must be valid JSON")
     try:
-        return DesignPayload.model_validate(obj)
+        return _PAYLOAD_ADAPTER.validate_json(payload)
     except ValidationError as e:
-        raise HTTPException(status_code=422, detail=e.errors()) from e
+        if e.error_count() and e.errors(include_url=False)[0]["type"] == "json_invalid":
+            return _unprocessable("payload must be valid JSON")
+        return _unprocessable(e.json().encode("utf-8"))
+
+def _save_upload(src: BinaryIO, dst: Path) -> None:
+    """Stream an upload to disk in 1 MiB chunks instead of reading it into memory."""
+    with dst.open("wb") as f:
+        shutil.copyfileobj(src, f, 1 << 20)
 
 def create_app() -> FastAPI:
     """Create a FastAPI app."""
     cfg = load_config(Path("config.json"))
+    # Fail at boot, not per request, on a bad MPNN_* switch.
+    runner_env()
     app = FastAPI(title="mpnn", version="0.1.0")
     app.state.config = cfg
 
@@ -54,27 +86,17 @@ def create_app() -> FastAPI:
     def health() -> Dict[str, str]:
         return {"status": "ok"}
 
-    @app.post("/design")
-    async def design(
-        structure: UploadFile = File(..., description="Structure file (.pdb, .cif, .mmcif)"),
-        payload: str = Form(
-            ...,
-            description=(
-                'JSON string. Fields: "chains" (empty/missing for all-chains) and '
-                '"num_sequences" (empty/missing uses server default). Optional field: "model_name".'
-            ),
-        ),
-    ) -> Dict[str, Any]:
-        blob = await structure.read()
-
+    # Responses are serialized by pydantic-core directly; `responses` keeps the OpenAPI schema.
+    @app.post("/design", responses={200: {"model": DesignResponse}})
+    async def design(structure: _StructureFile, payload: _PayloadField, run: _RunDesign) -> Response:
         p = _parse_payload(payload)
+        if isinstance(p, Response):
+            return p
         cfg: AppConfig = app.state.config
 
         # Apply server-side defaults for empty/missing fields.
         if p.num_sequences is None:
             p = p.model_copy(update={"num_sequences": cfg.model_defaults.num_sequences})
-        if p.chains is None:
-            p = p.model_copy(update={"chains": ""})
 
         job_dir = Path(cfg.jobs_dir) / uuid4().hex
         inputs_dir = job_dir / "inputs"
@@ -82,7 +104,7 @@ def create_app() -> FastAPI:
 
         filename = structure.filename or "input.pdb"
         uploaded_path = inputs_dir / Path(filename).name
-        uploaded_path.write_bytes(blob)
+        await anyio.to_thread.run_sync(_save_upload, structure.file, uploaded_path)
 
         limiter = app.state.design_limiter
         try:
@@ -97,7 +119,7 @@ def create_app() -> FastAPI:
         try:
             resp = await anyio.to_thread.run_sync(
                 functools.partial(
-                    run_design,
+                    run,
                     job_dir=job_dir,
                     structure_path=uploaded_path,
                     original_filename=Path(filename).name,
@@ -105,10 +127,11 @@ def create_app() -> FastAPI:
                     model_defaults=cfg.model_defaults,
                     proteinmpnn_dir=cfg.proteinmpnn_dir,
                     timeout_sec=cfg.timeout_sec,
+                    cache_dir=cfg.cif_cache_dir,
                 )
             )
         except InputError as e:
-            raise HTTPException(status_code=422, detail=str(e)) from e
+            return _unprocessable(str(e))
         except ExecutionError as e:
             raise HTTPException(
                 status_code=500,
@@ -122,7 +145,7 @@ def create_app() -> FastAPI:
         finally:
             limiter.release()
 
-        return resp.model_dump()
+        return Response(resp.model_dump_json(), media_type="application/json")
 
     # Mount Dash at "/" LAST so /health and /design match first
     from .ui import create_dash_server
@@ -3,6 +3,7 @@
 import base64
 import json
 from collections import defaultdict
+import numpy as np
 import requests
 from dash import Dash, Input, Output, State, dcc, html
 from flask import request as flask_request
@@ -23,10 +24,51 @@ S_DIFF = {"background": "#ffe8a3", "borderRadius": "3px"}
 S_BOX = {"border": "1px solid #ddd", "borderRadius": "10px", "padding": "10px", "marginTop": "10px"}
 
 
-def highlight(seq: str, original: str):
+_NUMPY_MIN_LEN = 256
+
+
+def _diff_mask(seq: str, original: str) -> np.ndarray:
+    """True where seq differs from original (positions past original count as changed)."""
+    mask = np.ones(len(seq), dtype=bool)
+    n = min(len(seq), len(original))
+    if n >= _NUMPY_MIN_LEN and seq.isascii() and original.isascii():
+        # Byte-wise compare in NumPy instead of a per-character Python loop.
+        a = np.frombuffer(seq.encode("ascii"), dtype=np.uint8, count=n)
+        b = np.frombuffer(original.encode("ascii"), dtype=np.uint8, count=n)
+        mask[:n] = a != b
+    elif n:
+        mask[:n] = [x != y for x, y in zip(seq, original)]
+    return mask
+
+
+def _diff_masks(seqs: list, original: str) -> list:
+    """_diff_mask for each of seqs, in one (N, L) compare when they all match original's length."""
+    n = len(original)
+    if (
+        seqs
+        and n * len(seqs) >= _NUMPY_MIN_LEN
+        and all(len(s) == n for s in seqs)
+        and original.isascii()
+        and all(s.isascii() for s in seqs)
+    ):
+        designed = np.frombuffer("".join(seqs).encode("ascii"), dtype=np.uint8).reshape(len(seqs), n)
+        return list(designed != np.frombuffer(original.encode("ascii"), dtype=np.uint8))
+    return [_diff_mask(s, original) for s in seqs]
+
+
+def highlight(seq: str, original: str, mask: np.ndarray | None = None):
+    if not seq:
+        return html.Pre("", style={**S_MONO, "margin": 0})
+    if seq == original:
+        # Common for unchanged chains; str equality is a memcmp.
+        return html.Pre([seq], style={**S_MONO, "margin": 0})
+    if mask is None:
+        mask = _diff_mask(seq, original)
+    # One child per run of same/changed residues rather than one per residue.
+    bounds = [0, *(np.flatnonzero(mask[1:] != mask[:-1]) + 1).tolist(), len(seq)]
     children = [
-        html.Span(ch, style=S_DIFF) if i >= len(original) or ch != original[i] else ch
-        for i, ch in enumerate(seq)
+        html.Span(seq[start:end], style=S_DIFF) if mask[start] else seq[start:end]
+        for start, end in zip(bounds, bounds[1:])
     ]
     return html.Pre(children, style={**S_MONO, "margin": 0})
 
@@ -54,12 +96,12 @@ def render_results(data: dict):
                 html.Pre(orig_seq, style={**S_MONO, "margin": 0}),
             ]
 
-        for d in chain_designs:
+        seqs = [d.get("sequence") or "" for d in chain_designs]
+        for d, seq, mask in zip(chain_designs, seqs, _diff_masks(seqs, orig_seq)):
             rank = d.get("rank", "")
-            seq = d.get("sequence") or ""
             children += [
                 html.Div(f"Designed (rank {rank})", style={"marginTop": 10, "fontWeight": 600}),
-                highlight(seq, orig_seq),
+                highlight(seq, orig_seq, mask),
             ]
 
         if not orig_seq and not chain_designs:
@@ -83,7 +125,7 @@ def create_dash_server(*, model_defaults: AppConfig.ModelDefaults):
                         id="upload",
                         children=html.Button("Upload PDB/CIF"),
                         multiple=False,
-                        accept=".pdb,.cif,.mmcif",
+                        accept=".pdb,.cif,.mmcif,.cif.gz,.mmcif.gz",
                     ),
                     html.Div(id="file_name", style={"minWidth": "240px"}),
                     dcc.Input(
@@ -32,6 +32,7 @@ def main() -> None:
         model_defaults=cfg.model_defaults,
         proteinmpnn_dir=Path(args.proteinmpnn_dir) if args.proteinmpnn_dir else cfg.proteinmpnn_dir,
         timeout_sec=args.timeout_sec if args.timeout_sec is not None else cfg.timeout_sec,
+        cache_dir=cfg.cif_cache_dir,
     )
 
     print(json.dumps(resp.model_dump(), indent=2))
@@ -4,7 +4,7 @@ from __future__ import annotations
 import json
 from pathlib import Path
 from typing import Dict, List, Optional, Union
-from pydantic import BaseModel, Field, AliasChoices
+from pydantic import BaseModel, Field, AliasChoices, field_validator
 from pydantic.config import ConfigDict
 
 # ---------------------------
@@ -19,6 +19,8 @@ class InputError(CoreError):
 class ExecutionError(CoreError):
     """Raised when an external command fails."""
 
+    __slots__ = ("returncode", "stdout", "stderr")
+
     def __init__(self, message: str, *, returncode: int, stdout: str, stderr: str):
         super().__init__(message)
         self.returncode = returncode
@@ -50,6 +52,8 @@ class AppConfig(BaseModel):
     timeout_sec: int = Field(ge=1)
     # Max number of concurrent /design executions per process.
     max_concurrent_jobs: int = Field(default=2, ge=1)
+    # Cross-job cache of CIF->PDB conversions; unset disables it. Keep it outside jobs_dir.
+    cif_cache_dir: Optional[Path] = None
     model_defaults: ModelDefaults
 
 def load_config(path: Path) -> AppConfig:
@@ -77,9 +81,22 @@ class DesignPayload(_BaseModel):
     num_sequences: Optional[int] = Field(default=None, ge=1, le=10)
     model_name: Optional[str] = Field(default=None, serialization_alias="model_name")
 
+    # Form clients send null / "" for "not set"; normalize before type checks.
+    @field_validator("chains", mode="before")
+    @classmethod
+    def _chains_null_is_all(cls, v):
+        return "" if v is None else v
+
+    @field_validator("num_sequences", mode="before")
+    @classmethod
+    def _num_sequences_blank_is_default(cls, v):
+        return None if v == "" else v
+
 class DesignMetadata(_BaseModel):
     model_version: str
     runtime_ms: int
+    # ProteinMPNN process CPU time (user + sys); None where it can't be measured.
+    cpu_ms: Optional[int] = None
 
 class DesignedSequence(_BaseModel):
     chain: str
@@ -1,10 +1,10 @@
 """Model execution pipeline."""
 
 from __future__ import annotations
-import os
+from dataclasses import asdict, dataclass
 from pathlib import Path
+from typing import Optional
 from importlib.metadata import PackageNotFoundError, version as pkg_version
-from pydantic import BaseModel, Field
 
 from ..core import AppConfig, DesignMetadata, DesignPayload, DesignResponse, ExecutionError
 from .io import (
@@ -16,18 +16,25 @@ from .io import (
     parse_outputs,
     rename_first_fasta_to_result,
     run_proteinmpnn,
+    supports_cif,
 )
+from .env import runner_env
 from .metadata import collect_versions, get_repo_git_sha, sha256_file, write_checksums, write_json
 
 
-class _ResolvedModelArgs(BaseModel):
-    model_config = {"protected_namespaces": ()}
+@dataclass(frozen=True, slots=True)
+class _ResolvedModelArgs:
+    """Internal container; inputs are already validated upstream."""
     model_name: str
     sampling_temp: str
     batch_size: int
     num_sequences: int
     seed: int
 
+# Resolved once: (attribute name, serialized key) for the manifest snapshot.
+_PAYLOAD_KEYS = tuple((n, f.serialization_alias or n) for n, f in DesignPayload.model_fields.items())
+
+
 def _resolve_model_args(payload: DesignPayload, defaults: AppConfig.ModelDefaults) -> _ResolvedModelArgs:
     return _ResolvedModelArgs(
         # Only model_name can be overridden by request. Other model execution
@@ -49,16 +56,24 @@ def run_design(
     model_defaults: AppConfig.ModelDefaults,
     proteinmpnn_dir: Path,
     timeout_sec: int,
+    cache_dir: Optional[Path] = None,
 ) -> DesignResponse:
-    """Run a ProteinMPNN design job."""
+    """Run a ProteinMPNN design job (cache_dir: optional cross-job CIF conversion cache)."""
 
     pm_dir = proteinmpnn_dir
     to_sec = timeout_sec
 
     model_args = _resolve_model_args(payload, model_defaults)
+    user_chains = normalize_chains(payload.chains)
 
-    # 1) workspace + normalize input structure
-    ws = make_workspace(job_dir=job_dir, structure_path=structure_path, original_filename=original_filename)
+    # 1) workspace + normalize input structure (CIF passed through if ProteinMPNN reads it)
+    ws = make_workspace(
+        job_dir=job_dir,
+        structure_path=structure_path,
+        original_filename=original_filename,
+        keep_cif=supports_cif(pm_dir),
+        cache_dir=cache_dir,
+    )
 
     base_name = ws.normalized_pdb.stem
 
@@ -73,7 +88,6 @@ def run_design(
     )
 
     # 3) if chain not given, infer from pdb and use all chains
-    user_chains = normalize_chains(payload.chains)
     chain_list_for_jsonl = user_chains or infer_chains_from_parsed_jsonl(parsed_jsonl)
     if not chain_list_for_jsonl:
         raise ExecutionError(
@@ -95,7 +109,7 @@ def run_design(
     )
 
     # 5) run ProteinMPNN
-    runtime_ms = run_proteinmpnn(
+    runtime_ms, cpu_ms = run_proteinmpnn(
         proteinmpnn_dir=pm_dir,
         jsonl_path=parsed_jsonl,
         chain_id_jsonl=chain_ids_jsonl,
@@ -112,8 +126,6 @@ def run_design(
     rename_first_fasta_to_result(ws.model_outputs_dir / "seqs", stem=base_name)
 
     # 6) Build response
-    user_chains = normalize_chains(payload.chains)
-    parsed_jsonl = ws.artifacts_dir / "parsed_pdbs.jsonl"
     res_fa = (ws.model_outputs_dir / "seqs") / f"{base_name}_res.fa"
     original, designed = parse_outputs(
         res_fa=res_fa,
@@ -121,14 +133,15 @@ def run_design(
         chains_requested=user_chains,
     )
 
-    resp = DesignResponse(
-        metadata=DesignMetadata(model_version=model_args.model_name, runtime_ms=runtime_ms),
+    # Every field is produced here (not user input), so skip re-validation.
+    resp = DesignResponse.model_construct(
+        metadata=DesignMetadata.model_construct(model_version=model_args.model_name, runtime_ms=runtime_ms, cpu_ms=cpu_ms),
         designed_sequences=designed,
         original_sequences=original,
     )
 
-    # 7) Persist API response artifact
-    write_json(ws.responses_dir / "response.json", resp.model_dump())
+    # 7) Persist API response artifact (pydantic-core serializes straight to JSON)
+    (ws.responses_dir / "response.json").write_bytes(resp.model_dump_json(indent=2).encode("utf-8") + b"\n")
 
     # 8) Metadata: manifest + versions + checksums
     raw_input_sha256 = sha256_file(ws.uploaded_path)
@@ -137,7 +150,7 @@ def run_design(
     model_git_sha = get_repo_git_sha(pm_dir)
 
     # container image must be provided by the runtime (e.g., docker compose / k8s manifest).
-    container_image = os.getenv("CONTAINER_IMAGE")
+    container_image = runner_env().container_image
     if not container_image:
         raise RuntimeError(
             "Missing required env var CONTAINER_IMAGE. Set it in docker compose or with -e CONTAINER_IMAGE=<image>."
@@ -151,7 +164,7 @@ def run_design(
     app_version = (versions.get("app") or {}).get("version", "")
 
     # inputs/manifest.json is intended to be an immutable snapshot of *inputs only*.
-    request_payload = payload.model_dump(by_alias=True)
+    request_payload = {key: getattr(payload, name) for name, key in _PAYLOAD_KEYS}
     manifest = {
         "original_filename": ws.uploaded_path.name,
         "request": request_payload,
@@ -163,9 +176,10 @@ def run_design(
     run_metadata = {
         "effective": {
             "chains": payload.chains,
-            **model_args.model_dump(),
+            **asdict(model_args),
         },
         "runtime_ms": runtime_ms,
+        "cpu_ms": cpu_ms,
         "checksums": {
             "input_sha256": raw_input_sha256,
         },
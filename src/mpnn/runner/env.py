@@ -0,0 +1,28 @@
+"""Process-level runner switches read from the environment."""
+
+from __future__ import annotations
+import functools
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+_CIF_BACKENDS = ("auto", "gemmi", "biopython")
+
+@dataclass(frozen=True, slots=True)
+class RunnerEnv:
+    """Snapshot of the runner's environment variables."""
+    forkserver: bool  # MPNN_FORKSERVER=1
+    cif_backend: str  # MPNN_CIF_BACKEND: auto | gemmi | biopython
+    container_image: Optional[str]  # CONTAINER_IMAGE
+
+@functools.cache
+def runner_env() -> RunnerEnv:
+    """Read the environment once per process; tests call runner_env.cache_clear() after setenv."""
+    backend = os.getenv("MPNN_CIF_BACKEND", "auto").strip().lower()
+    if backend not in _CIF_BACKENDS:
+        raise ValueError(f"Unknown MPNN_CIF_BACKEND: {backend!r}")
+    return RunnerEnv(
+        forkserver=os.getenv("MPNN_FORKSERVER", "") == "1",
+        cif_backend=backend,
+        container_image=os.getenv("CONTAINER_IMAGE") or None,
+    )
@@ -1,19 +1,29 @@
 """helpers for filesystem I/O and running ProteinMPNN subprocesses."""
 
 from __future__ import annotations
-import json
+import contextlib
+import functools
+import gzip
+import importlib.util
+import mmap
+import os
 import re
+import select
 import shutil
+import string
 import subprocess
 import sys
+import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from Bio import SeqIO
-from Bio.PDB import MMCIFParser, PDBIO
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import orjson
 
 from ..core import DesignedSequence, ExecutionError, InputError
+from . import worker
+from .env import runner_env
+from .metadata import fast_digest_file
 
 @dataclass(frozen=True)
 class Workspace:
@@ -29,76 +39,349 @@ class Workspace:
     metadata_dir: Path
     log_path: Path  # logs/run.log
     uploaded_path: Path  # inputs/<original_filename>
-    normalized_pdb: Path  # artifacts/<base_name>.pdb (original or converted)
+    normalized_pdb: Path  # artifacts/<base_name>.pdb (original or converted), or .cif if passed through
 
 # ----------------------------
 # Generic helpers
 # ----------------------------
+def _is_gzip(path: Path) -> bool:
+    with path.open("rb") as f:
+        return f.read(2) == b"\x1f\x8b"
+
+_PDB_CHAIN_IDS = string.ascii_uppercase + string.ascii_lowercase + string.digits
+
+def _pdb_chain_id_map(ids: Iterable[str]) -> Dict[str, str]:
+    """Map chain IDs to unique single-character PDB IDs.
+
+    IDs that are already one character keep it; longer IDs are truncated to
+    their first character unless that is taken, in which case they get the
+    next unused one from A-Z, a-z, 0-9 (deterministic, in input order).
+    """
+    ids = list(dict.fromkeys(ids))
+    first = {cid: (cid.strip()[:1] or "A") for cid in ids}
+    mapping: Dict[str, str] = {}
+    taken = set()
+    for cid in sorted(ids, key=lambda c: first[c] != c):
+        if first[cid] not in taken:
+            mapping[cid] = first[cid]
+            taken.add(first[cid])
+    free = (c for c in _PDB_CHAIN_IDS if c not in taken)
+    for cid in ids:
+        if cid not in mapping:
+            mapping[cid] = next(free, first[cid])
+    return mapping
+
+def cif_backend() -> str:
+    """The CIF parser convert_cif_to_pdb will use: "gemmi" or "biopython".
+
+    MPNN_CIF_BACKEND selects it: "auto" (default: gemmi if installed),
+    "gemmi" (required) or "biopython".
+    """
+    backend = runner_env().cif_backend
+    if backend == "auto":
+        return "gemmi" if importlib.util.find_spec("gemmi") is not None else "biopython"
+    return backend
+
 def convert_cif_to_pdb(cif_path: Path, pdb_path: Path) -> None:
-    parser = MMCIFParser(QUIET=True)
-    structure = parser.get_structure("cif", str(cif_path))
+    """Convert mmCIF (optionally gzipped) to PDB with unique one-character chain IDs."""
+    if cif_backend() == "biopython":
+        _convert_cif_to_pdb_biopython(cif_path, pdb_path)
+        return
+    import gemmi
+
+    if _is_gzip(cif_path):
+        st = gemmi.read_structure_string(gzip.decompress(cif_path.read_bytes()), format=gemmi.CoorFormat.Mmcif)
+    else:
+        st = gemmi.read_structure(str(cif_path), format=gemmi.CoorFormat.Mmcif)
+    st.setup_entities()
+    for model in st:
+        new_names = _pdb_chain_id_map(chain.name for chain in model)
+        for chain in model:
+            chain.name = new_names[chain.name]
+    st.write_pdb(str(pdb_path))
+
+_BIO_TLS = threading.local()
+
+def _convert_cif_to_pdb_biopython(cif_path: Path, pdb_path: Path) -> None:
+    # One parser/writer pair per thread, built on first use (Biopython is heavy
+    # to import). Both keep per-call state, so they are not shared across threads.
+    pair = getattr(_BIO_TLS, "parser_io", None)
+    if pair is None:
+        from Bio.PDB import MMCIFParser, PDBIO
+
+        pair = _BIO_TLS.parser_io = (MMCIFParser(QUIET=True), PDBIO())
+    parser, io = pair
+    if _is_gzip(cif_path):
+        with gzip.open(cif_path, "rt", encoding="utf-8") as handle:
+            structure = parser.get_structure("cif", handle)
+    else:
+        structure = parser.get_structure("cif", str(cif_path))
     models = list(structure)
     if models:
-        for chain in models[0]:
-            cid = str(chain.id) if chain.id is not None else "A"
-            chain.id = (cid.strip()[:1] or "A")
-    io = PDBIO()
+        chains = list(models[0])
+        new_ids = _pdb_chain_id_map("A" if c.id is None else str(c.id) for c in chains)
+        renamed = [(c, new_ids["A" if c.id is None else str(c.id)]) for c in chains]
+        renamed = [(c, nid) for c, nid in renamed if c.id != nid]
+        # Park renamed chains on placeholder IDs first so no intermediate ID
+        # collides with a sibling (Biopython raises ValueError on a clash).
+        for i, (c, _nid) in enumerate(renamed):
+            c.id = ("_", i)
+        for c, nid in renamed:
+            c.id = nid
     io.set_structure(structure)
     io.save(str(pdb_path))
 
-def run_cmd(cmd: List[str], *, timeout_sec: int) -> Tuple[int, str, str, int]:
+def _wait_cpu_ms(proc: subprocess.Popen, timeout_sec: int) -> Optional[int]:
+    """Reap proc with os.wait4 (so its rusage is available); return its CPU time in ms.
+
+    The child is waited on through a pidfd so the timeout needs no polling loop.
+    Where pidfd_open is missing or refused (Linux < 5.3, seccomp), falls back to
+    proc.wait() and returns None.
+    """
+    try:
+        pidfd = os.pidfd_open(proc.pid)
+    except (AttributeError, OSError):
+        proc.wait(timeout_sec)
+        return None
+    try:
+        poller = select.poll()
+        poller.register(pidfd, select.POLLIN)
+        exited = poller.poll(timeout_sec * 1000)
+    finally:
+        os.close(pidfd)
+    if not exited:
+        raise subprocess.TimeoutExpired(proc.args, timeout_sec)
+    _pid, status, ru = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    return int((ru.ru_utime + ru.ru_stime) * 1000)
+
+def run_cmd(
+    cmd: Sequence[str],
+    *,
+    timeout_sec: int,
+    stdout_path: Optional[Path] = None,
+    stderr_path: Optional[Path] = None,
+) -> Tuple[int, bytes, bytes, int, Optional[int]]:
+    """Run a command, capturing raw stdout/stderr bytes (decoded only on demand).
+
+    Returns (rc, stdout, stderr, runtime_ms, cpu_ms). With stdout_path/stderr_path,
+    the child appends that stream straight to the file and the corresponding
+    returned bytes are empty. cpu_ms (child user+sys time) is only measured when
+    both streams go to files and the kernel supports pidfd_open; otherwise it is None.
+    """
+    if cmd and cmd[0] == sys.executable and worker.enabled():
+        return worker.run_script(cmd, timeout_sec=timeout_sec, stdout_path=stdout_path, stderr_path=stderr_path)
     t0 = time.perf_counter()
-    proc = subprocess.run(
-        cmd,
-        check=False,
-        capture_output=True,
-        text=True,
-        timeout=timeout_sec,
-    )
+    with contextlib.ExitStack() as stack:
+        out = stack.enter_context(stdout_path.open("ab")) if stdout_path is not None else subprocess.PIPE
+        err = stack.enter_context(stderr_path.open("ab")) if stderr_path is not None else subprocess.PIPE
+        if out is subprocess.PIPE or err is subprocess.PIPE:
+            proc = subprocess.run(cmd, check=False, stdout=out, stderr=err, timeout=timeout_sec)
+            cpu_ms = None
+        else:
+            proc = subprocess.Popen(cmd, stdout=out, stderr=err)
+            try:
+                cpu_ms = _wait_cpu_ms(proc, timeout_sec)
+            finally:
+                # Timeout or any other error: never leave the child running unreaped.
+                if proc.returncode is None:
+                    proc.kill()
+                    proc.wait()
     runtime_ms = int((time.perf_counter() - t0) * 1000)
-    return proc.returncode, (proc.stdout or ""), (proc.stderr or ""), runtime_ms
+    return proc.returncode, (proc.stdout or b""), (proc.stderr or b""), runtime_ms, cpu_ms
 
-def append_log(
-    log_path: Path,
+def _as_text(data: bytes) -> str:
+    return data.decode("utf-8", "replace")
+
+def _append_bytes(log_path: Path, data: bytes) -> int:
+    """Append to the log in one write; return the file size afterwards."""
+    with log_path.open("ab") as f:
+        f.write(data)
+        return f.tell()
+
+def _read_range_tail(path: Path, start: int, end: int, limit: int = 64 * 1024) -> bytes:
+    begin = max(start, end - limit)
+    with path.open("rb") as f:
+        f.seek(begin)
+        return f.read(end - begin)
+
+def run_cmd_to_log(
+    cmd: Sequence[str],
     *,
     title: str,
-    cmd: List[str],
-    rc: int,
-    out: str,
-    err: str,
-    runtime_ms: int,
-) -> None:
+    log_path: Path,
+    timeout_sec: int,
+) -> Tuple[int, bytes, bytes, int, Optional[int]]:
+    """Run a command with its output streamed to disk instead of memory.
+
+    stdout goes straight into log_path (tail-able while the step runs); stderr
+    is spooled next to it and copied into the log's stderr section afterwards.
+    Returns (rc, stdout, stderr, runtime_ms, cpu_ms); on failure stdout/stderr
+    are the last 64 KiB of each stream read back from disk, otherwise empty.
+    """
     log_path.parent.mkdir(parents=True, exist_ok=True)
-    with log_path.open("a", encoding="utf-8") as f:
-        f.write(f"\n===== {title} =====\n")
-        f.write("cmd: " + " ".join(cmd) + "\n")
-        f.write(f"returncode: {rc}\n")
-        f.write(f"runtime_ms: {runtime_ms}\n")
-        f.write("\n---- stdout ----\n")
-        f.write(out.rstrip("\n") + "\n")
-        f.write("\n---- stderr ----\n")
-        f.write(err.rstrip("\n") + "\n")
+    header = f"\n===== {title} =====\ncmd: {' '.join(cmd)}\n\n---- stdout ----\n"
+    start = _append_bytes(log_path, header.encode("utf-8"))
+    err_spool = log_path.parent / f".{title}.stderr"
+    err_spool.unlink(missing_ok=True)
+    rc: Optional[int] = None
+    out = err = b""
+    status = "error"
+    try:
+        try:
+            rc, out, err, ms, cpu_ms = run_cmd(cmd, timeout_sec=timeout_sec, stdout_path=log_path, stderr_path=err_spool)
+        except subprocess.TimeoutExpired:
+            status = "timeout"
+            raise
+        finally:
+            # Close the step's block even when run_cmd raised (e.g. timeout), so run.log
+            # always has a stderr section and footer. Returned bytes, if any, are logged too.
+            end = _append_bytes(log_path, out) if out else log_path.stat().st_size
+            with log_path.open("ab") as log:
+                log.write(b"\n---- stderr ----\n")
+                log.write(err)
+                last = err[-1:]
+                if err_spool.exists():
+                    with err_spool.open("rb") as spool:
+                        shutil.copyfileobj(spool, log, 1024 * 1024)
+                        if spool.tell():
+                            spool.seek(-1, os.SEEK_END)
+                            last = spool.read(1)
+                if last != b"\n":
+                    log.write(b"\n")
+                if rc is None:
+                    log.write(f"returncode: {status}\n".encode("utf-8"))
+                else:
+                    log.write(f"returncode: {rc}\nruntime_ms: {ms}\n".encode("utf-8"))
+                    if cpu_ms is not None:
+                        log.write(f"cpu_ms: {cpu_ms}\n".encode("utf-8"))
+
+        if rc != 0:
+            out = _read_range_tail(log_path, start, end)
+            if err_spool.exists():
+                err += _read_range_tail(err_spool, 0, err_spool.stat().st_size)
+        else:
+            out, err = b"", b""
+    finally:
+        err_spool.unlink(missing_ok=True)
+    return rc, out, err, ms, cpu_ms
 
 def normalize_chains(chains: Optional[object]) -> List[str]:
     """Return uppercase unique chain IDs. Empty list => all chains."""
     if not chains:
         return []
     s = ",".join(chains) if isinstance(chains, list) else str(chains)
+    # Fresh list per call; the cached tuple is shared.
+    return list(_normalize_chain_spec(s))
+
+@functools.lru_cache(maxsize=256)
+def _normalize_chain_spec(s: str) -> Tuple[str, ...]:
+    # Requests reuse a handful of specs ("A", "A,B"), so parse each once.
     s = s.strip().strip('"\'')
-    if not s:
-        return []
-    out: List[str] = []
-    for p in s.split(","):
-        p = p.strip()
-        if not p:
-            continue
-        c = p[0].upper()
-        if c not in out:
-            out.append(c)
-    return out
-
-def make_workspace(*, job_dir: Path, structure_path: Path, original_filename: str) -> Workspace:
-    """Create job workspace folders and normalize uploaded structure."""
+    if "," not in s:
+        # Common single-chain spec ("A"): no split/dedup needed.
+        s = s.strip()
+        return (s[0].upper(),) if s else ()
+    # dict.fromkeys: order-preserving dedup without the O(n^2) membership scan.
+    return tuple(dict.fromkeys(p[0].upper() for p in map(str.strip, s.split(",")) if p))
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """Hard-link src to dst (no bytes moved); copy if linking is not possible."""
+    dst.unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+# A quoted ".cif" / "*.cif" literal, as in glob(folder + '*.cif').
+_CIF_PATTERN_RE = re.compile(rb"""['"]\*?\.cif['"]""")
+
+@functools.lru_cache(maxsize=8)
+def supports_cif(proteinmpnn_dir: Path) -> bool:
+    """True if this ProteinMPNN checkout's parse_multiple_chains.py picks up *.cif inputs.
+
+    Probed once per checkout by looking for a ".cif" pattern in the helper script;
+    upstream ProteinMPNN only globs *.pdb, so this is False unless a fork adds it.
+    """
+    helper = proteinmpnn_dir / "helper_scripts" / "parse_multiple_chains.py"
+    try:
+        src = helper.read_bytes()
+    except OSError:
+        return False
+    return _CIF_PATTERN_RE.search(src) is not None
+
+def _convert_cif(cif_path: Path, pdb_path: Path) -> None:
+    if worker.enabled():
+        worker.pool().submit(convert_cif_to_pdb, cif_path, pdb_path).result()
+    else:
+        convert_cif_to_pdb(cif_path, pdb_path)
+
+_CIF_CACHE_MAX = 64
+# Bump whenever conversion output changes (chain-ID mapping, writer tweaks), so
+# entries from older images on a persistent cache volume are never reused.
+_CIF_CACHE_VERSION = 1
+
+@functools.lru_cache(maxsize=2)
+def _cif_backend_version(backend: str) -> str:
+    if backend == "gemmi":
+        import gemmi
+
+        return gemmi.__version__
+    import Bio
+
+    return Bio.__version__
+
+def _mtime(path: Path) -> float:
+    # Another job may evict the entry between glob() and stat().
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return 0.0
+
+def _convert_cif_cached(cif_path: Path, pdb_path: Path, cache_dir: Path) -> None:
+    """Convert CIF to PDB, reusing an earlier conversion of byte-identical input.
+
+    Results live in cache_dir keyed by content digest, the backend (and its
+    version) that produced them and _CIF_CACHE_VERSION; the _CIF_CACHE_MAX most recently used are kept. Entries may
+    be evicted by a concurrent job at any point, so a vanished entry is a miss.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    backend = cif_backend()
+    cached = cache_dir / (
+        f"{fast_digest_file(cif_path)}-{backend}-{_cif_backend_version(backend)}-v{_CIF_CACHE_VERSION}.pdb"
+    )
+    try:
+        os.utime(cached)
+        _link_or_copy(cached, pdb_path)
+        return
+    except FileNotFoundError:
+        pass
+    tmp = cache_dir / f".{cached.name}.{os.getpid()}.{threading.get_ident()}"
+    try:
+        _convert_cif(cif_path, tmp)
+        # Link the job's copy before publishing, so eviction can't race it.
+        _link_or_copy(tmp, pdb_path)
+        os.replace(tmp, cached)
+    finally:
+        tmp.unlink(missing_ok=True)
+    entries = sorted(cache_dir.glob("*.pdb"), key=_mtime, reverse=True)
+    for old in entries[_CIF_CACHE_MAX:]:
+        old.unlink(missing_ok=True)
+
+def make_workspace(
+    *,
+    job_dir: Path,
+    structure_path: Path,
+    original_filename: str,
+    keep_cif: bool = False,
+    cache_dir: Optional[Path] = None,
+) -> Workspace:
+    """Create job workspace folders and normalize uploaded structure.
+
+    With keep_cif, uncompressed mmCIF uploads are linked into artifacts/ as
+    <stem>.cif instead of being converted to PDB. With cache_dir, CIF→PDB
+    conversions are shared across jobs uploading identical files.
+    """
     job_dir.mkdir(parents=True, exist_ok=True)
     inputs_dir = job_dir / "inputs"
     artifacts_dir = job_dir / "artifacts"
@@ -123,16 +406,22 @@ def make_workspace(*, job_dir: Path, structure_path: Path, original_filename: st
 
     # Create normalized PDB under artifacts/
     n = uploaded_path.name.lower()
-    stem = uploaded_path.stem or "input"
+    stem = Path(uploaded_path.name[:-3] if n.endswith(".gz") else uploaded_path.name).stem or "input"
     normalized_pdb = artifacts_dir / f"{stem}.pdb"
 
     if n.endswith(".pdb"):
         if uploaded_path.resolve() != normalized_pdb.resolve():
-            shutil.copyfile(uploaded_path, normalized_pdb)
-    elif n.endswith(".cif") or n.endswith(".mmcif"):
-        convert_cif_to_pdb(uploaded_path, normalized_pdb)
+            _link_or_copy(uploaded_path, normalized_pdb)
+    elif keep_cif and n.endswith((".cif", ".mmcif")) and not _is_gzip(uploaded_path):
+        normalized_pdb = artifacts_dir / f"{stem}.cif"
+        _link_or_copy(uploaded_path, normalized_pdb)
+    elif n.endswith((".cif", ".mmcif", ".cif.gz", ".mmcif.gz")):
+        if cache_dir is not None:
+            _convert_cif_cached(uploaded_path, normalized_pdb, cache_dir)
+        else:
+            _convert_cif(uploaded_path, normalized_pdb)
     else:
-        raise InputError("Upload must be .pdb, .cif, or .mmcif")
+        raise InputError("Upload must be .pdb, .cif, .mmcif, .cif.gz, or .mmcif.gz")
 
     return Workspace(
         job_dir=job_dir,
@@ -153,18 +442,17 @@ def make_workspace(*, job_dir: Path, structure_path: Path, original_filename: st
 # ----------------------------
 def parse_multiple_chains(*, proteinmpnn_dir: Path, input_dir: Path, parsed_jsonl: Path, log_path: Path, timeout_sec: int) -> None:
     helper = proteinmpnn_dir / "helper_scripts" / "parse_multiple_chains.py"
-    cmd = [
+    cmd = (
         sys.executable,
-        str(helper),
+        os.fspath(helper),
         "--input_path",
-        str(input_dir),
+        os.fspath(input_dir),
         "--output_path",
-        str(parsed_jsonl),
-    ]
-    rc, out, err, ms = run_cmd(cmd, timeout_sec=timeout_sec)
-    append_log(log_path, title="parse_multiple_chains", cmd=cmd, rc=rc, out=out, err=err, runtime_ms=ms)
+        os.fspath(parsed_jsonl),
+    )
+    rc, out, err, _ms, _cpu_ms = run_cmd_to_log(cmd, title="parse_multiple_chains", log_path=log_path, timeout_sec=timeout_sec)
     if rc != 0:
-        raise ExecutionError("parse_multiple_chains.py failed", returncode=rc, stdout=out, stderr=err)
+        raise ExecutionError("parse_multiple_chains.py failed", returncode=rc, stdout=_as_text(out), stderr=_as_text(err))
 
 def infer_chains_from_parsed_jsonl(parsed_jsonl: Path) -> List[str]:
     """Infer chain IDs from first jsonl record keys like seq_chain_A."""
@@ -172,19 +460,20 @@ def infer_chains_from_parsed_jsonl(parsed_jsonl: Path) -> List[str]:
     if not parsed_jsonl.exists():
         return []
 
-    # Fail fast if the helper produced malformed JSON.
-    line0 = next((ln for ln in parsed_jsonl.read_text(encoding="utf-8").splitlines() if ln.strip()), "")
+    # Only the first record is needed; stop reading at its newline.
+    line0 = b""
+    with parsed_jsonl.open("rb") as f:
+        for raw in f:
+            if raw.strip():
+                line0 = raw
+                break
     if not line0:
         return []
-    obj = json.loads(line0)
+    # Fail fast if the helper produced malformed JSON.
+    obj = orjson.loads(line0)
 
-    chains: List[str] = []
-    for k in obj.keys():
-        if k.startswith("seq_chain_"):
-            cid = k[len("seq_chain_") :]
-            if cid and cid not in chains:
-                chains.append(cid)
-    return sorted(chains)
+    # Keys are unique within a record; sorted order is what the split logic expects.
+    return sorted(k[len("seq_chain_") :] for k in obj if k.startswith("seq_chain_") and len(k) > len("seq_chain_"))
 
 def assign_fixed_chains(
     *,
@@ -196,20 +485,19 @@ def assign_fixed_chains(
     timeout_sec: int,
 ) -> None:
     helper = proteinmpnn_dir / "helper_scripts" / "assign_fixed_chains.py"
-    cmd = [
+    cmd = (
         sys.executable,
-        str(helper),
+        os.fspath(helper),
         "--input_path",
-        str(parsed_jsonl),
+        os.fspath(parsed_jsonl),
         "--output_path",
-        str(chain_id_jsonl),
+        os.fspath(chain_id_jsonl),
         "--chain_list",
         " ".join(chain_list),
-    ]
-    rc, out, err, ms = run_cmd(cmd, timeout_sec=timeout_sec)
-    append_log(log_path, title="assign_fixed_chains", cmd=cmd, rc=rc, out=out, err=err, runtime_ms=ms)
+    )
+    rc, out, err, _ms, _cpu_ms = run_cmd_to_log(cmd, title="assign_fixed_chains", log_path=log_path, timeout_sec=timeout_sec)
     if rc != 0:
-        raise ExecutionError("assign_fixed_chains.py failed", returncode=rc, stdout=out, stderr=err)
+        raise ExecutionError("assign_fixed_chains.py failed", returncode=rc, stdout=_as_text(out), stderr=_as_text(err))
 
 def run_proteinmpnn(
     *,
@@ -224,17 +512,18 @@ def run_proteinmpnn(
     seed: int,
     log_path: Path,
     timeout_sec: int,
-) -> int:
+) -> Tuple[int, Optional[int]]:
+    """Run protein_mpnn_run.py; return (runtime_ms, cpu_ms)."""
     mpnn = proteinmpnn_dir / "protein_mpnn_run.py"
-    cmd = [
+    cmd = (
         sys.executable,
-        str(mpnn),
+        os.fspath(mpnn),
         "--jsonl_path",
-        str(jsonl_path),
+        os.fspath(jsonl_path),
         "--chain_id_jsonl",
-        str(chain_id_jsonl),
+        os.fspath(chain_id_jsonl),
         "--out_folder",
-        str(out_folder),
+        os.fspath(out_folder),
         "--num_" + "seq_per_target",
         str(num_sequences),
         "--sampling_temp",
@@ -245,12 +534,11 @@ def run_proteinmpnn(
         str(seed),
         "--model_name",
         str(model_name),
-    ]
-    rc, out, err, ms = run_cmd(cmd, timeout_sec=timeout_sec)
-    append_log(log_path, title="protein_mpnn_run", cmd=cmd, rc=rc, out=out, err=err, runtime_ms=ms)
+    )
+    rc, out, err, ms, cpu_ms = run_cmd_to_log(cmd, title="protein_mpnn_run", log_path=log_path, timeout_sec=timeout_sec)
     if rc != 0:
-        raise ExecutionError("ProteinMPNN failed", returncode=rc, stdout=out, stderr=err)
-    return ms
+        raise ExecutionError("ProteinMPNN failed", returncode=rc, stdout=_as_text(out), stderr=_as_text(err))
+    return ms, cpu_ms
 
 # ----------------------------
 # Outputs
@@ -260,22 +548,50 @@ def rename_first_fasta_to_result(seqs_dir: Path, *, stem: str) -> Path | None:
 
     seqs_dir.mkdir(parents=True, exist_ok=True)
 
-    cands = sorted(list(seqs_dir.glob("*.fa")) + list(seqs_dir.glob("*.fasta")))
-    cands = [p for p in cands if not p.name.endswith("_res.fa") and not p.name.endswith("_res.fasta")]
+    # One directory scan; same candidates as glob("*.fa") + glob("*.fasta"), which
+    # match dotfiles too, minus directories.
+    with os.scandir(seqs_dir) as it:
+        cands = sorted(
+            e.name
+            for e in it
+            if e.name.endswith((".fa", ".fasta"))
+            and not e.name.endswith(("_res.fa", "_res.fasta"))
+            and e.is_file()
+        )
     if not cands:
         return None
 
-    src = cands[0]
+    src = seqs_dir / cands[0]
     dst = seqs_dir / f"{stem}_res.fa"
     if dst.exists():
         dst.unlink()
     src.rename(dst)
     return dst
 
+def _iter_fasta_sequences(fasta_path: Path) -> Iterator[str]:
+    """Yield record sequences from a FASTA file (headers are not needed).
+
+    The file is mapped rather than read; records are located with find() and
+    copied out one at a time as they are consumed.
+    """
+    with fasta_path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = mm.find(b">")
+            while pos >= 0:
+                nxt = mm.find(b"\n>", pos + 1)
+                end = len(mm) if nxt < 0 else nxt
+                body = mm.find(b"\n", pos, end)
+                yield b"".join(mm[body + 1 : end].split()).decode("ascii") if body >= 0 else ""
+                pos = nxt + 1 if nxt >= 0 else -1
+
+_CHAIN_SEPS = ("/", ":", "|", ",")
+
 def _split_multichain_sequence(seq: str, chains: List[str]) -> List[str]:
     if len(chains) <= 1:
         return [seq]
-    for sep in ["/", ":", "|", ","]:
+    for sep in _CHAIN_SEPS:
         if sep in seq:
             parts = [p.strip() for p in seq.split(sep) if p.strip()]
             if len(parts) == len(chains):
@@ -297,14 +613,15 @@ def parse_outputs(
     design_all = len(chains_requested) == 0
     requested = set(chains_requested)
 
-    records = list(SeqIO.parse(str(res_fa), "fasta"))
-    if not records:
+    records = _iter_fasta_sequences(res_fa)
+    orig_seq = next(records, None)
+    if orig_seq is None:
         return {}, []
 
     original_by_chain: Dict[str, str] = {}
+    # Values come from our own FASTA parse, so skip per-field validation.
     designed: List[DesignedSequence] = []
 
-    orig_seq = str(records[0].seq)
     orig_parts = _split_multichain_sequence(orig_seq, all_chains)
     if len(orig_parts) == len(all_chains):
         for c, part in zip(all_chains, orig_parts):
@@ -312,18 +629,24 @@ def parse_outputs(
     else:
         original_by_chain[",".join(all_chains)] = orig_seq
 
+    # Loop invariants: ProteinMPNN uses one separator for every record, so
+    # detect it once from the original and only fall back per record on mismatch.
+    n_chains = len(all_chains)
+    chain_label = ",".join(all_chains)
+    selected = [(i, c) for i, c in enumerate(all_chains) if design_all or c in requested]
+    sep = next((s for s in _CHAIN_SEPS if s in orig_seq), None) if n_chains > 1 else None
+
     rank = 1
-    for rec in records[1:]:
-        seq = str(rec.seq)
-        parts = _split_multichain_sequence(seq, all_chains)
-
-        if len(parts) == len(all_chains):
-            for c, part in zip(all_chains, parts):
-                if design_all or c in requested:
-                    designed.append(DesignedSequence(chain=c, rank=rank, sequence=part))
+    for seq in records:
+        parts = [p.strip() for p in seq.split(sep) if p.strip()] if sep else [seq]
+        if len(parts) != n_chains:
+            parts = _split_multichain_sequence(seq, all_chains)
+
+        if len(parts) == n_chains:
+            for i, c in selected:
+                designed.append(DesignedSequence.model_construct(chain=c, rank=rank, sequence=parts[i]))
         else:
-            chain_label = ",".join(all_chains)
-            designed.append(DesignedSequence(chain=chain_label, rank=rank, sequence=seq))
+            designed.append(DesignedSequence.model_construct(chain=chain_label, rank=rank, sequence=seq))
 
         rank += 1
 
@@ -1,27 +1,47 @@
 """Run metadata and checksums"""
 
 from __future__ import annotations
+import functools
 import hashlib
 import importlib.metadata
-import json
 import subprocess
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Tuple
+import orjson
 
 def sha256_bytes(data: bytes) -> str:
     h = hashlib.sha256()
     h.update(data)
     return h.hexdigest()
 
+def fast_digest_file(path: Path) -> str:
+    """Cheap content key for caching (BLAKE2b-128 of the file, streamed).
+
+    Not a provenance hash: checksums.sha256 and manifests stay on SHA-256.
+    """
+    with path.open("rb", buffering=0) as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+        h = hashlib.blake2b(digest_size=16)
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
 def sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
-    with path.open("rb") as f:
+    with path.open("rb", buffering=0) as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+: C read loop
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
         for chunk in iter(lambda: f.read(1024 * 1024), b""):
             h.update(chunk)
     return h.hexdigest()
 
+@functools.lru_cache(maxsize=8)
 def get_repo_git_sha(repo_dir: Path) -> str:
-    """Return `git rev-parse HEAD` for a local git repo."""
+    """Return `git rev-parse HEAD` for a local git repo.
+
+    Cached per process: the ProteinMPNN checkout is fixed for a container's lifetime.
+    """
 
     cmd = ["git", "-C", str(repo_dir), "rev-parse", "HEAD"]
     out = subprocess.check_output(cmd, text=True).strip()
@@ -29,26 +49,36 @@ def get_repo_git_sha(repo_dir: Path) -> str:
         raise RuntimeError(f"git rev-parse returned empty output for: {repo_dir}")
     return out
 
+@functools.lru_cache(maxsize=1)
+def _app_version() -> str:
+    try:
+        return importlib.metadata.version("mpnn")
+    except Exception:
+        return ""
+
 def collect_versions(*, model_name: str, model_git_sha: str, container_image: str) -> Dict[str, Any]:
     """Collect lightweight version metadata."""
     if not model_git_sha:
         raise ValueError("model_git_sha is required")
     if not container_image:
         raise ValueError("container_image must be non-empty")
-    try:
-        app_version = importlib.metadata.version("mpnn")
-    except Exception:
-        app_version = ""
     return {
-        "app": {"name": "mpnn", "version": app_version},
+        "app": {"name": "mpnn", "version": _app_version()},
         "model": {"model_name": model_name},
         "model_git_sha": model_git_sha,
         "container_image": container_image,
     }
 
 def write_json(path: Path, obj: Any) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(obj, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    # Single encode + single write; callers' parent dirs normally exist already.
+    # Unlike json.dumps, non-ASCII is written as raw UTF-8 (not \uXXXX) and floats
+    # in shortest form (1e-07 -> 1e-7); same layout otherwise (2-space indent, sorted keys).
+    data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE)
+    try:
+        path.write_bytes(data)
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
 
 def write_checksums(
     *,
@@ -57,14 +87,7 @@ def write_checksums(
     files: Iterable[Path],
 ) -> List[Tuple[str, str]]:
     """Write a sha256sum-style file."""
-    rows: List[Tuple[str, str]] = []
-    for p in files:
-        if not p.exists() or not p.is_file():
-            continue
-        rel = str(p.relative_to(job_dir))
-        rows.append((sha256_file(p), rel))
+    rows: List[Tuple[str, str]] = [(sha256_file(p), str(p.relative_to(job_dir))) for p in files if p.is_file()]
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    with out_path.open("w", encoding="utf-8") as f:
-        for h, rel in rows:
-            f.write(f"{h}  {rel}\n")
+    out_path.write_bytes("".join(f"{h}  {rel}\n" for h, rel in rows).encode("utf-8"))
     return rows
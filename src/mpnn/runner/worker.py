@@ -0,0 +1,89 @@
+"""Run ProteinMPNN scripts from a preloaded forkserver instead of a fresh interpreter.
+
+Enabled with MPNN_FORKSERVER=1. The forkserver imports numpy/torch once; each
+script still runs in its own forked child, so timeouts can kill it in isolation.
+The same context backs a small process pool for GIL-bound work (CIF conversion).
+"""
+
+from __future__ import annotations
+import multiprocessing as mp
+import os
+import resource
+import runpy
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+from .env import runner_env
+
+# This module is preloaded so children skip re-importing it. "__main__" is not:
+# the forkserver would re-run the server's entry script, which need not be guarded.
+_PRELOAD = [__name__, "numpy", "torch"]
+_CTX: Optional[mp.context.BaseContext] = None
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+
+def enabled() -> bool:
+    return runner_env().forkserver
+
+def _context() -> mp.context.BaseContext:
+    global _CTX
+    if _CTX is None:
+        ctx = mp.get_context("forkserver")
+        # Missing modules are skipped by the forkserver, so this is safe without torch.
+        ctx.set_forkserver_preload(_PRELOAD)
+        _CTX = ctx
+    return _CTX
+
+def pool() -> ProcessPoolExecutor:
+    """Shared forkserver-backed pool, so pure-Python work doesn't hold the server's GIL."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) // 2), mp_context=_context())
+    return _POOL
+
+def _exec_script(script: str, argv: Sequence[str], out_path: str, err_path: str, cpu_path: str) -> None:
+    # Point fds 1/2 at files so C-level output (torch, numpy) is captured too.
+    with open(out_path, "ab") as out, open(err_path, "ab") as err:
+        os.dup2(out.fileno(), 1)
+        os.dup2(err.fileno(), 2)
+    sys.argv = [script, *argv]
+    sys.path.insert(0, os.path.dirname(script))
+    try:
+        runpy.run_path(script, run_name="__main__")
+    finally:
+        # The parent can't wait4() a forkserver child, so report rusage from here.
+        ru = resource.getrusage(resource.RUSAGE_SELF)
+        Path(cpu_path).write_text(str(int((ru.ru_utime + ru.ru_stime) * 1000)))
+
+def run_script(
+    cmd: Sequence[str],
+    *,
+    timeout_sec: int,
+    stdout_path: Optional[Path] = None,
+    stderr_path: Optional[Path] = None,
+) -> Tuple[int, bytes, bytes, int, Optional[int]]:
+    """Run `[python, script, *args]` in a forkserver child; same contract as run_cmd."""
+    with tempfile.TemporaryDirectory(prefix="mpnn-worker-") as td:
+        out_path = stdout_path if stdout_path is not None else Path(td) / "stdout"
+        err_path = stderr_path if stderr_path is not None else Path(td) / "stderr"
+        cpu_path = Path(td) / "cpu_ms"
+        proc = _context().Process(target=_exec_script, args=(cmd[1], cmd[2:], str(out_path), str(err_path), str(cpu_path)))
+        t0 = time.perf_counter()
+        proc.start()
+        proc.join(timeout_sec)
+        if proc.is_alive():
+            proc.kill()
+            proc.join()
+            raise subprocess.TimeoutExpired(cmd, timeout_sec)
+        runtime_ms = int((time.perf_counter() - t0) * 1000)
+        out = out_path.read_bytes() if stdout_path is None and out_path.exists() else b""
+        err = err_path.read_bytes() if stderr_path is None and err_path.exists() else b""
+        cpu_ms = int(cpu_path.read_text()) if cpu_path.exists() else None
+    return int(proc.exitcode or 0), out, err, runtime_ms, cpu_ms
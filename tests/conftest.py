@@ -4,6 +4,7 @@ from __future__ import annotations
 import json
 import sys
 from pathlib import Path
+from typing import Iterator
 import pytest
 from fastapi.testclient import TestClient
 
@@ -13,11 +14,10 @@ SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
-@pytest.fixture
-def cfg_dict(tmp_path: Path) -> dict:
+def _default_cfg(root: Path) -> dict:
     return {
-        "jobs_dir": str(tmp_path / "runs"),
-        "proteinmpnn_dir": str(tmp_path / "ProteinMPNN"),
+        "jobs_dir": str(root / "runs"),
+        "proteinmpnn_dir": str(root / "ProteinMPNN"),
         "timeout_sec": 30,
         "max_concurrent_jobs": 2,
         "model_defaults": {
@@ -30,11 +30,39 @@ def cfg_dict(tmp_path: Path) -> dict:
     }
 
 @pytest.fixture
-def client(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, cfg_dict: dict) -> TestClient:
-    (tmp_path / "config.json").write_text(json.dumps(cfg_dict), encoding="utf-8")
-    monkeypatch.chdir(tmp_path)
-    monkeypatch.setenv("CONTAINER_IMAGE", "test-image")
+def cfg_dict(tmp_path: Path) -> dict:
+    return _default_cfg(tmp_path)
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory: pytest.TempPathFactory) -> Iterator[TestClient]:
+    # One app per test module: startup (routes, Dash layout) is paid once.
+    # Jobs land in client.app.state.config.jobs_dir.
+    root = tmp_path_factory.mktemp("app")
+    (root / "config.json").write_text(json.dumps(_default_cfg(root)), encoding="utf-8")
 
     from mpnn.app.api import create_app
+    from mpnn.runner.env import runner_env
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(root)
+        mp.setenv("CONTAINER_IMAGE", "test-image")
+        runner_env.cache_clear()
+        try:
+            with TestClient(create_app()) as c:
+                yield c
+        finally:
+            # Don't leak this module's env snapshot (CONTAINER_IMAGE) into later ones.
+            runner_env.cache_clear()
+
+@pytest.fixture
+def cif_backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    """Pin MPNN_CIF_BACKEND ("biopython" unless parametrized with indirect=True)."""
+    backend = getattr(request, "param", "biopython")
+    if backend == "gemmi":
+        pytest.importorskip("gemmi")
+    from mpnn.runner.env import runner_env
 
-    return TestClient(create_app())
+    monkeypatch.setenv("MPNN_CIF_BACKEND", backend)
+    runner_env.cache_clear()
+    yield backend
+    runner_env.cache_clear()
@@ -19,7 +19,7 @@ def _minimal_pdb_bytes() -> bytes:
         "TER\nEND\n"
     ).encode("utf-8")
 
-def test_design_integration_mock_model_writes_artifacts(client, tmp_path: Path, monkeypatch):
+def test_design_integration_mock_model_writes_artifacts(client, monkeypatch):
     # Patch the subprocess execution layer so we don't need real ProteinMPNN.
     import mpnn.runner.io as rio
     import mpnn.runner.metadata as rmeta
@@ -27,7 +27,7 @@ def test_design_integration_mock_model_writes_artifacts(client, tmp_path: Path,
     monkeypatch.setattr(rmeta, "get_repo_git_sha", lambda _p: "deadbeef")
     monkeypatch.setattr(rdesign, "get_repo_git_sha", lambda _p: "deadbeef")
 
-    def fake_run_cmd(cmd, *, timeout_sec: int):
+    def fake_run_cmd(cmd, *, timeout_sec: int, stdout_path=None, stderr_path=None):
         cmd_str = " ".join(str(x) for x in cmd)
 
         # helper_scripts/parse_multiple_chains.py
@@ -35,14 +35,14 @@ def test_design_integration_mock_model_writes_artifacts(client, tmp_path: Path,
             out_path = Path(cmd[cmd.index("--output_path") + 1])
             out_path.parent.mkdir(parents=True, exist_ok=True)
             out_path.write_text(json.dumps({"seq_chain_A": "AAAA"}) + "\n", encoding="utf-8")
-            return 0, "", "", 5
+            return 0, b"", b"", 5, None
 
         # helper_scripts/assign_fixed_chains.py
         if "assign_fixed_chains.py" in cmd_str:
             out_path = Path(cmd[cmd.index("--output_path") + 1])
             out_path.parent.mkdir(parents=True, exist_ok=True)
             out_path.write_text(json.dumps({"fixed_chains": []}) + "\n", encoding="utf-8")
-            return 0, "", "", 5
+            return 0, b"", b"", 5, None
 
         # protein_mpnn_run.py
         if "protein_mpnn_run.py" in cmd_str:
@@ -56,12 +56,16 @@ def test_design_integration_mock_model_writes_artifacts(client, tmp_path: Path,
                 fasta.append(f">design_{i}\nCCCC\n")
 
             (seqs_dir / "mock.fa").write_text("".join(fasta), encoding="utf-8")
-            return 0, "", "", 50
+            return 0, b"", b"", 50, 40
 
         raise AssertionError(f"Unexpected command: {cmd_str}")
 
     monkeypatch.setattr(rio, "run_cmd", fake_run_cmd)
 
+    # jobs_dir is shared by every test using this module's client.
+    runs = Path(client.app.state.config.jobs_dir)
+    before = set(runs.iterdir()) if runs.exists() else set()
+
     r = client.post(
         "/design",
         files={"structure": ("mini.pdb", _minimal_pdb_bytes(), "chemical/x-pdb")},
@@ -70,12 +74,12 @@ def test_design_integration_mock_model_writes_artifacts(client, tmp_path: Path,
     assert r.status_code == 200
     data = r.json()
     assert "metadata" in data
+    assert data["metadata"]["cpu_ms"] == 40
     assert "designed_sequences" in data
     assert "original_sequences" in data
 
     # Confirm the job workspace was created and key artifacts exist.
-    runs = tmp_path / "runs"
-    jobs = [p for p in runs.iterdir() if p.is_dir()]
+    jobs = [p for p in runs.iterdir() if p.is_dir() and p not in before]
     assert len(jobs) == 1
     job = jobs[0]
 
@@ -1,13 +1,17 @@
 """""input validation."""
 
 from __future__ import annotations
-import json
+import orjson
+import pytest
 from mpnn.core import DesignMetadata, DesignedSequence, DesignResponse
 import mpnn.app.api as api
 
-def _post(client, payload: dict | str):
-    if isinstance(payload, dict):
-        payload = json.dumps(payload)
+_EXPECTED_KEYS = frozenset({"metadata", "designed_sequences", "original_sequences"})
+
+def _post(client, payload: dict | str | bytes):
+    if type(payload) is dict:
+        # Form fields accept bytes, so the encoded payload is sent as-is.
+        payload = orjson.dumps(payload)
     return client.post(
         "/design",
         files={"structure": ("toy.pdb", b"X", "chemical/x-pdb")},
@@ -17,29 +21,48 @@ def _post(client, payload: dict | str):
 def test_missing_required_multipart_fields(client):
     assert client.post("/design").status_code == 422
 
-def test_bad_payload_json(client):
-    r = _post(client, "{not-json")
+@pytest.mark.parametrize(
+    "payload, expected_detail",
+    [
+        ("{not-json", "payload must be valid JSON"),
+        # schema: num_sequences >= 1 and <= 10
+        ({"num_sequences": 11}, None),
+        ({"num_sequences": -1}, None),
+        # schema: chains must be str or list[str]
+        ({"chains": 123}, None),
+    ],
+)
+def test_design_rejects(client, payload, expected_detail):
+    r = _post(client, payload)
     assert r.status_code == 422
-    assert r.json()["detail"] == "payload must be valid JSON"
-
-def test_num_sequences_invalid(client):
-    # schema: num_sequences >= 1 and <= 10
-    assert _post(client, {"num_sequences": 11}).status_code == 422
-    assert _post(client, {"num_sequences": -1}).status_code == 422
-
-def test_chains_invalid(client):
-    # schema: chains must be str or list[str]
-    assert _post(client, {"chains": 123}).status_code == 422
+    if expected_detail is not None:
+        assert r.json()["detail"] == expected_detail
 
-def test_valid_request(client, monkeypatch):
+def test_valid_request(client):
     def fake_run_design(*args, **kwargs):
         return DesignResponse(
             metadata=DesignMetadata(model_version="mock", runtime_ms=1),
             designed_sequences=[DesignedSequence(chain="A", rank=1, sequence="ACDE")],
             original_sequences={"A": "AAAA"},
         )
-    monkeypatch.setattr(api, "run_design", fake_run_design)
-    r = _post(client, {"chains": None, "num_sequences": 1})
+    client.app.dependency_overrides[api.get_run_design] = lambda: fake_run_design
+    try:
+        r = _post(client, {"chains": None, "num_sequences": 1})
+    finally:
+        client.app.dependency_overrides.clear()
     assert r.status_code == 200
     data = r.json()
-    assert set(data.keys()) >= {"metadata", "designed_sequences", "original_sequences"}
+    assert _EXPECTED_KEYS <= data.keys()
+
+def test_bad_cif_backend_fails_at_startup(tmp_path, cfg_dict, monkeypatch):
+    from mpnn.runner.env import runner_env
+
+    (tmp_path / "config.json").write_text(orjson.dumps(cfg_dict).decode(), encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("MPNN_CIF_BACKEND", "gemi")
+    runner_env.cache_clear()
+    try:
+        with pytest.raises(ValueError, match="MPNN_CIF_BACKEND"):
+            api.create_app()
+    finally:
+        runner_env.cache_clear()
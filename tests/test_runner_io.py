@@ -0,0 +1,224 @@
+"""runner.io helpers (no ProteinMPNN needed)."""
+
+from __future__ import annotations
+import errno
+import gzip
+import os
+import subprocess
+import sys
+import orjson
+import pytest
+import mpnn.runner.io as rio
+
+def _enosys(_pid):
+    raise OSError(errno.ENOSYS, "pidfd_open")
+
+def test_run_cmd_without_pidfd_open(tmp_path, monkeypatch):
+    monkeypatch.setattr(os, "pidfd_open", _enosys, raising=False)
+    out, err = tmp_path / "out", tmp_path / "err"
+    rc, _o, _e, _ms, cpu_ms = rio.run_cmd(
+        [sys.executable, "-c", "print('hi')"], timeout_sec=30, stdout_path=out, stderr_path=err
+    )
+    assert rc == 0
+    assert cpu_ms is None
+    assert out.read_text() == "hi\n"
+
+def test_run_cmd_timeout_reaps_child(tmp_path, monkeypatch):
+    monkeypatch.setattr(os, "pidfd_open", _enosys, raising=False)
+    pid_file = tmp_path / "pid"
+    code = f"import os, time; open({str(pid_file)!r}, 'w').write(str(os.getpid())); time.sleep(30)"
+    with pytest.raises(subprocess.TimeoutExpired):
+        rio.run_cmd(
+            [sys.executable, "-c", code], timeout_sec=1, stdout_path=tmp_path / "out", stderr_path=tmp_path / "err"
+        )
+    # Killed and reaped: the pid no longer exists (not even as a zombie).
+    with pytest.raises(ProcessLookupError):
+        os.kill(int(pid_file.read_text()), 0)
+
+def _cif_text(chains) -> str:
+    """Minimal mmCIF with one CA atom per chain (auth_asym_id = chain ID)."""
+    rows = [
+        f"ATOM {i} C CA . ALA {cid} 1 {i} ? {i}.000 0.000 0.000 1.00 0.00 1 ALA {cid} CA 1"
+        for i, cid in enumerate(chains, start=1)
+    ]
+    return "\n".join(
+        [
+            "data_toy",
+            "loop_",
+            *(
+                f"_atom_site.{k}"
+                for k in (
+                    "group_PDB id type_symbol label_atom_id label_alt_id label_comp_id label_asym_id "
+                    "label_entity_id label_seq_id pdbx_PDB_ins_code Cartn_x Cartn_y Cartn_z occupancy "
+                    "B_iso_or_equiv auth_seq_id auth_comp_id auth_asym_id auth_atom_id pdbx_PDB_model_num"
+                ).split()
+            ),
+            *rows,
+            "",
+        ]
+    )
+
+def test_cif_cache_reuses_and_survives_eviction(tmp_path, monkeypatch, cif_backend):
+    calls = []
+    real = rio._convert_cif
+    monkeypatch.setattr(rio, "_convert_cif", lambda src, dst: (calls.append(src), real(src, dst)))
+    cif = tmp_path / "x.cif"
+    cif.write_text(_cif_text(["A"]))
+    cache = tmp_path / "cache"
+    rio._convert_cif_cached(cif, tmp_path / "1.pdb", cache)
+    rio._convert_cif_cached(cif, tmp_path / "2.pdb", cache)
+    assert len(calls) == 1
+    (entry,) = cache.glob("*.pdb")
+    import Bio
+
+    assert entry.name.endswith(f"-biopython-{Bio.__version__}-v{rio._CIF_CACHE_VERSION}.pdb")
+    # Evicted by another job between runs: converted again, not an error.
+    entry.unlink()
+    rio._convert_cif_cached(cif, tmp_path / "3.pdb", cache)
+    assert len(calls) == 2
+    assert (tmp_path / "3.pdb").read_bytes() == (tmp_path / "1.pdb").read_bytes()
+
+def test_cif_cache_eviction_tolerates_vanished_entries(tmp_path, monkeypatch, cif_backend):
+    monkeypatch.setattr(rio, "_CIF_CACHE_MAX", 1)
+    cache = tmp_path / "cache"
+    cache.mkdir()
+    ghost = cache / "gone.pdb"
+    real_glob = type(cache).glob
+    # An entry listed by glob() but unlinked by a concurrent job before stat().
+    monkeypatch.setattr(type(cache), "glob", lambda self, pat: [*real_glob(self, pat), ghost])
+    for i, cid in enumerate("AB"):
+        cif = tmp_path / f"{cid}.cif"
+        cif.write_text(_cif_text([cid]))
+        rio._convert_cif_cached(cif, tmp_path / f"{i}.pdb", cache)
+    assert len(list(real_glob(cache, "*.pdb"))) == 1
+
+def test_pdb_chain_id_map_keeps_single_char_ids():
+    assert rio._pdb_chain_id_map(["AA", "AB", "A"]) == {"A": "A", "AA": "B", "AB": "C"}
+    assert rio._pdb_chain_id_map(["A", "AA", "AB"]) == {"A": "A", "AA": "B", "AB": "C"}
+
+def test_pdb_chain_id_map_more_than_62_chains():
+    ids = [f"X{i}" for i in range(70)]
+    mapping = rio._pdb_chain_id_map(ids)
+    assert list(mapping) == ids
+    # The 62 available IDs are handed out once each, then the first character is reused.
+    assert sorted(mapping[c] for c in ids[:62]) == sorted(rio._PDB_CHAIN_IDS)
+    assert all(mapping[c] == "X" for c in ids[62:])
+
+def _pdb_chain_ids(pdb_path) -> list:
+    return list(dict.fromkeys(line[21] for line in pdb_path.read_text().splitlines() if line.startswith("ATOM")))
+
+@pytest.mark.parametrize("cif_backend", ["biopython", "gemmi"], indirect=True)
+def test_convert_cif_truncated_id_collides_with_sibling(tmp_path, cif_backend):
+    cif = tmp_path / "x.cif"
+    # "AB" truncates to "A" (taken by a sibling); "BC" keeps "B".
+    cif.write_text(_cif_text(["AB", "A", "BC"]))
+    rio.convert_cif_to_pdb(cif, tmp_path / "x.pdb")
+    assert _pdb_chain_ids(tmp_path / "x.pdb") == ["C", "A", "B"]
+
+@pytest.mark.parametrize("cif_backend", ["biopython", "gemmi"], indirect=True)
+@pytest.mark.parametrize(
+    "name, gzipped",
+    [
+        ("x.cif.gz", True),
+        ("x.mmcif.gz", True),
+        ("X.CIF.GZ", True),
+        # Compression is detected from the magic bytes, not the suffix.
+        ("x.cif", True),
+        ("x.mmcif", False),
+    ],
+)
+def test_make_workspace_converts_cif_uploads(tmp_path, cif_backend, name, gzipped):
+    data = _cif_text(["A"]).encode()
+    upload = tmp_path / name
+    upload.write_bytes(gzip.compress(data) if gzipped else data)
+    ws = rio.make_workspace(job_dir=tmp_path / "job", structure_path=upload, original_filename=name)
+    assert ws.normalized_pdb == ws.artifacts_dir / f"{name.split('.')[0]}.pdb"
+    assert _pdb_chain_ids(ws.normalized_pdb) == ["A"]
+
+@pytest.mark.parametrize("gzipped", [False, True])
+def test_make_workspace_keep_cif_only_passes_plain_cif(tmp_path, cif_backend, gzipped):
+    data = _cif_text(["A"]).encode()
+    upload = tmp_path / "x.cif"
+    upload.write_bytes(gzip.compress(data) if gzipped else data)
+    ws = rio.make_workspace(job_dir=tmp_path / "job", structure_path=upload, original_filename="x.cif", keep_cif=True)
+    if gzipped:
+        # ProteinMPNN can't read compressed CIF, so it is converted instead.
+        assert ws.normalized_pdb == ws.artifacts_dir / "x.pdb"
+        assert _pdb_chain_ids(ws.normalized_pdb) == ["A"]
+    else:
+        assert ws.normalized_pdb == ws.artifacts_dir / "x.cif"
+        assert ws.normalized_pdb.read_bytes() == data
+
+def test_make_workspace_rejects_pdb_gz(tmp_path):
+    upload = tmp_path / "x.pdb.gz"
+    upload.write_bytes(gzip.compress(b"END\n"))
+    with pytest.raises(rio.InputError):
+        rio.make_workspace(job_dir=tmp_path / "job", structure_path=upload, original_filename=upload.name)
+
+def test_rename_first_fasta_to_result_matches_glob_selection(tmp_path):
+    seqs = tmp_path / "seqs"
+    seqs.mkdir()
+    for name in ["b.fasta", ".hidden.fa", "old_res.fa", "notes.txt"]:
+        (seqs / name).write_text(">x\nA\n")
+    (seqs / "a.fa").mkdir()
+    # Sorted like glob("*.fa") + glob("*.fasta"); directories are never picked.
+    assert rio.rename_first_fasta_to_result(seqs, stem="s") == seqs / "s_res.fa"
+    assert not (seqs / ".hidden.fa").exists()
+    assert (seqs / "b.fasta").exists()
+    assert rio.rename_first_fasta_to_result(seqs, stem="t") == seqs / "t_res.fa"
+    assert not (seqs / "b.fasta").exists()
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        (b"", []),
+        (b">a\nACDE\n>b\nFGHI\n", ["ACDE", "FGHI"]),
+        (b">a\r\nACDE\r\n>b\r\nFG\r\nHI\r\n", ["ACDE", "FGHI"]),
+        (b">a\nAC\nDE\n\n>b\nFG\n  HI\n", ["ACDE", "FGHI"]),
+        (b">a\n>b\nFGHI\n>c", ["", "FGHI", ""]),
+        # Text before the first ">" is skipped (ProteinMPNN never writes any).
+        (b"leading text\nACDE\n>a\nFGHI", ["FGHI"]),
+        (b"no records\n", []),
+    ],
+)
+def test_iter_fasta_sequences(tmp_path, text, expected):
+    fa = tmp_path / "x.fa"
+    fa.write_bytes(text)
+    assert list(rio._iter_fasta_sequences(fa)) == expected
+
+def _parse(tmp_path, fasta: str, chains, requested):
+    (tmp_path / "parsed.jsonl").write_text(
+        orjson.dumps({f"seq_chain_{c}": "" for c in chains}).decode() + "\n", encoding="utf-8"
+    )
+    (tmp_path / "res.fa").write_text(fasta, encoding="utf-8")
+    original, designed = rio.parse_outputs(
+        res_fa=tmp_path / "res.fa", parsed_jsonl=tmp_path / "parsed.jsonl", chains_requested=requested
+    )
+    return original, [(d.chain, d.rank, d.sequence) for d in designed]
+
+def test_parse_outputs_splits_chains_on_original_separator(tmp_path):
+    fasta = ">orig\nAAAA/BBBB\n>d1\nCCCC/DDDD\n>d2\nEEEE/FFFF\n"
+    original, designed = _parse(tmp_path, fasta, ["A", "B"], ["B"])
+    assert original == {"A": "AAAA", "B": "BBBB"}
+    assert designed == [("B", 1, "DDDD"), ("B", 2, "FFFF")]
+
+def test_parse_outputs_per_record_separator_fallback(tmp_path):
+    # d1 uses a different separator than the original; d2 can't be split at all.
+    fasta = ">orig\nAAAA/BBBB\n>d1\nCCCC:DDDD\n>d2\nEEEEFFFF\n"
+    original, designed = _parse(tmp_path, fasta, ["A", "B"], [])
+    assert original == {"A": "AAAA", "B": "BBBB"}
+    assert designed == [("A", 1, "CCCC"), ("B", 1, "DDDD"), ("A,B", 2, "EEEEFFFF")]
+
+def test_parse_outputs_single_chain_ignores_separators(tmp_path):
+    original, designed = _parse(tmp_path, ">orig\nAA/AA\n>d1\nCC/CC\n", ["A"], [])
+    assert original == {"A": "AA/AA"}
+    assert designed == [("A", 1, "CC/CC")]
+
+def test_run_cmd_to_log_timeout_closes_log_block(tmp_path):
+    log = tmp_path / "logs" / "run.log"
+    code = "import sys, time; print('partial', flush=True); print('warn', file=sys.stderr, flush=True); time.sleep(30)"
+    with pytest.raises(subprocess.TimeoutExpired):
+        rio.run_cmd_to_log([sys.executable, "-c", code], title="step", log_path=log, timeout_sec=1)
+    text = log.read_text()
+    assert text.endswith("---- stdout ----\npartial\n\n---- stderr ----\nwarn\nreturncode: timeout\n")
+    assert not (log.parent / ".step.stderr").exists()
@@ -0,0 +1,55 @@
+"""Forkserver runner (MPNN_FORKSERVER=1) with toy scripts."""
+
+from __future__ import annotations
+import subprocess
+import sys
+from pathlib import Path
+from typing import Iterator
+import pytest
+import mpnn.runner.io as rio
+from mpnn.runner import worker
+from mpnn.runner.env import runner_env
+
+@pytest.fixture
+def forkserver(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.setenv("MPNN_FORKSERVER", "1")
+    runner_env.cache_clear()
+    yield
+    if worker._POOL is not None:
+        worker._POOL.shutdown()
+        worker._POOL = None
+    runner_env.cache_clear()
+
+def _script(tmp_path: Path, body: str) -> Path:
+    p = tmp_path / "toy.py"
+    p.write_text(body, encoding="utf-8")
+    return p
+
+def test_run_script_captures_output_and_exit_code(tmp_path, forkserver):
+    script = _script(
+        tmp_path,
+        "import sys\nprint('out', *sys.argv[1:])\nprint('err', file=sys.stderr)\nsys.exit(3)\n",
+    )
+    rc, out, err, _ms, cpu_ms = rio.run_cmd([sys.executable, str(script), "x"], timeout_sec=30)
+    assert rc == 3
+    assert out == b"out x\n"
+    assert err == b"err\n"
+    assert cpu_ms is not None
+
+def test_run_script_uncaught_exception_goes_to_stderr(tmp_path, forkserver):
+    script = _script(tmp_path, "raise RuntimeError('boom')\n")
+    err_path = tmp_path / "err"
+    rc, _out, _err, _ms, _cpu = rio.run_cmd(
+        [sys.executable, str(script)], timeout_sec=30, stdout_path=tmp_path / "out", stderr_path=err_path
+    )
+    assert rc == 1
+    assert b"RuntimeError: boom" in err_path.read_bytes()
+
+def test_run_script_timeout_kills_child(tmp_path, forkserver):
+    script = _script(tmp_path, "import time\ntime.sleep(30)\n")
+    with pytest.raises(subprocess.TimeoutExpired):
+        rio.run_cmd([sys.executable, str(script)], timeout_sec=1)
+
+def test_pool_runs_work(forkserver):
+    assert worker.enabled()
+    assert worker.pool().submit(pow, 2, 10).result(timeout=60) == 1024
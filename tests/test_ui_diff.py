@@ -0,0 +1,70 @@
+"""Sequence diff highlighting in the Dash UI."""
+
+from __future__ import annotations
+import numpy as np
+import pytest
+from dash import html
+from mpnn.app import ui
+
+def _slow_mask(seq: str, original: str) -> list:
+    return [i >= len(original) or c != original[i] for i, c in enumerate(seq)]
+
+@pytest.mark.parametrize("n", [8, ui._NUMPY_MIN_LEN - 1, ui._NUMPY_MIN_LEN, 3 * ui._NUMPY_MIN_LEN])
+@pytest.mark.parametrize("delta", [0, 5, -5])
+def test_diff_mask_matches_per_residue_compare(n, delta):
+    rng = np.random.default_rng(n + delta)
+    original = "".join(rng.choice(list("ACDEFGHIKL"), size=n))
+    seq = "".join(rng.choice(list("ACDEFGHIKL"), size=n + delta))
+    mask = ui._diff_mask(seq, original)
+    assert mask.dtype == bool
+    assert mask.tolist() == _slow_mask(seq, original)
+
+def _rendered(pre: html.Pre) -> list:
+    return [("diff", c.children) if isinstance(c, html.Span) else ("same", c) for c in pre.children]
+
+def test_highlight_one_span_per_run():
+    assert _rendered(ui.highlight("AXXAAY", "AAAAAA")) == [
+        ("same", "A"),
+        ("diff", "XX"),
+        ("same", "AA"),
+        ("diff", "Y"),
+    ]
+
+def test_highlight_longer_and_shorter_design():
+    # Residues past the original's end count as changed.
+    assert _rendered(ui.highlight("AAAXY", "AAA")) == [("same", "AAA"), ("diff", "XY")]
+    assert _rendered(ui.highlight("AX", "AAAA")) == [("same", "A"), ("diff", "X")]
+
+def test_highlight_identical_and_empty():
+    assert ui.highlight("ACDE", "ACDE").children == ["ACDE"]
+    assert ui.highlight("", "ACDE").children == ""
+
+@pytest.mark.parametrize(
+    "lengths",
+    [
+        [300, 300, 300],  # one (N, L) compare
+        [4, 4],  # below _NUMPY_MIN_LEN in total
+        [300, 299, 305],  # ragged: per-sequence fallback
+    ],
+)
+def test_diff_masks_matches_diff_mask(lengths):
+    rng = np.random.default_rng(len(lengths) + sum(lengths))
+    original = "".join(rng.choice(list("ACDE"), size=lengths[0]))
+    seqs = ["".join(rng.choice(list("ACDE"), size=n)) for n in lengths]
+    masks = ui._diff_masks(seqs, original)
+    assert [m.tolist() for m in masks] == [_slow_mask(s, original) for s in seqs]
+
+def test_render_results_uses_batched_masks():
+    original = "A" * 300
+    data = {
+        "original_sequences": {"A": original},
+        "designed_sequences": [
+            {"chain": "A", "rank": 2, "sequence": "C" + original[1:]},
+            {"chain": "A", "rank": 1, "sequence": original[:-1] + "C"},
+        ],
+    }
+    pres = [c for c in ui.render_results(data).children[0].children if isinstance(c, html.Pre)]
+    # Original, then designs in rank order.
+    assert pres[0].children == original
+    assert _rendered(pres[1]) == [("same", "A" * 299), ("diff", "C")]
+    assert _rendered(pres[2]) == [("diff", "C"), ("same", "A" * 299)]